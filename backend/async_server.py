@@ -0,0 +1,228 @@
+# async_server.py - asyncio (aiohttp) server exposing the same API as server.py
+
+import argparse
+import asyncio
+import json
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+
+import aiofiles
+import aiofiles.os
+from aiohttp import web
+
+from kuhn_poker import KuhnPoker
+from training import train_and_save
+from hand_log import HandLog, HAND_LOG_PATH, is_valid_hand
+
+STATIC_FOLDER = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'frontend', 'build')
+
+EMPTY_METRICS = json.dumps({
+    "iterations": [],
+    "strategies": {},
+    "expected_payoffs": [],
+    "regrets": {}
+})
+
+
+class FileCache:
+    """Caches a file's contents and re-reads it only when its mtime changes"""
+
+    def __init__(self, path, parse):
+        self.path = path
+        self.parse = parse
+        self.mtime = None
+        self.value = None
+        self.lock = asyncio.Lock()
+
+    async def get(self, default):
+        try:
+            mtime = (await aiofiles.os.stat(self.path)).st_mtime_ns
+        except FileNotFoundError:
+            return default
+
+        if mtime != self.mtime:
+            async with self.lock:
+                if mtime != self.mtime:
+                    async with aiofiles.open(self.path, 'r') as f:
+                        contents = await f.read()
+                    self.value = self.parse(contents)
+                    self.mtime = mtime
+        return self.value
+
+
+def parse_cfr_strategy(contents):
+    """Turn strategies.json contents into the info set -> PASS probability map"""
+    strategies = json.loads(contents)
+    return {k: float(v[0]) for k, v in strategies["cfr"].items()}
+
+
+async def serve(request):
+    return web.FileResponse(os.path.join(request.app['static_folder'], 'index.html'))
+
+
+async def train(request):
+    """API endpoint to train the solvers"""
+    try:
+        data = await request.json()
+        iterations = data.get('iterations', 10000)
+        track_interval = data.get('track_interval', 100)
+
+        loop = asyncio.get_running_loop()
+        cfr_time = await loop.run_in_executor(
+            request.app['executor'], train_and_save,
+            request.app['static_folder'], iterations, track_interval)
+
+        return web.json_response({
+            "status": "success",
+            "message": f"Training completed with {iterations} iterations",
+            "training_time": {
+                "cfr": cfr_time
+            }
+        })
+    except Exception as e:
+        print(f"Training error: {str(e)}")
+        return web.json_response({"status": "error", "message": str(e)}, status=500)
+
+
+async def get_metrics(request):
+    """API endpoint to get metrics history"""
+    try:
+        # The file is already JSON, so it is served as-is without re-encoding
+        body = await request.app['metrics_cache'].get(EMPTY_METRICS)
+        return web.Response(text=body, content_type='application/json')
+    except Exception as e:
+        print(f"Metrics error: {str(e)}")
+        return web.json_response({"error": str(e)}, status=500)
+
+
+async def play_game(request):
+    """API endpoint to play a game against the CFR bot"""
+    data = await request.json()
+    player_card = data.get('playerCard')
+
+    # Load CFR strategy, falling back to a uniform strategy
+    try:
+        cfr_strategy = await request.app['strategy_cache'].get({})
+    except Exception:
+        cfr_strategy = {}
+
+    game = KuhnPoker()
+
+    # Deal cards
+    cards = list(range(1, game.num_cards + 1))
+    if player_card:
+        cards.remove(player_card)
+        cards.insert(0, player_card)
+    else:
+        random.shuffle(cards)
+
+    cards = cards[:2]  # Take only first 2 cards
+
+    history = data.get('history', [])
+
+    # If it's bot's turn. A PASS:BET hand ends on the player's action, so it
+    # can arrive already finished and the bot must not act on it
+    bot_acted = len(history) % 2 == 1 and not game.is_terminal(history)
+    if bot_acted:
+        info_set = game.get_info_set(cards[1], history)
+        pass_prob = cfr_strategy.get(info_set, 0.5)
+        action = game.PASS if random.random() < pass_prob else game.BET
+        history.append(action)
+
+    is_terminal = game.is_terminal(history)
+    payoff = game.get_payoff(cards, history) if is_terminal else 0
+
+    # Log hands the bot finished in this request, and PASS:BET hands the
+    # player finished after the bot's bet. The latter need a fixed playerCard
+    # so the bot is dealt the same card it bet with.
+    player_finished = not bot_acted and player_card and history[:2] == [game.PASS, game.BET]
+    if is_terminal and (bot_acted or player_finished) and is_valid_hand(game, cards, history):
+        request.app['hand_log'].append(cards, history, payoff)
+
+    return web.json_response({
+        'cards': cards,
+        'history': history,
+        'isTerminal': is_terminal,
+        'payoff': payoff
+    })
+
+
+async def get_hand_stats(request):
+    """API endpoint to get aggregate statistics over all logged hands"""
+    try:
+        # Scanning the memory-mapped log blocks, so it runs on a thread off the loop
+        loop = asyncio.get_running_loop()
+        stats = await loop.run_in_executor(None, request.app['hand_log'].aggregate)
+        return web.json_response(stats)
+    except Exception as e:
+        print(f"Hand stats error: {str(e)}")
+        return web.json_response({"error": str(e)}, status=500)
+
+
+@web.middleware
+async def cors_middleware(request, handler):
+    if request.method == 'OPTIONS':
+        response = web.Response()
+    else:
+        response = await handler(request)
+    response.headers['Access-Control-Allow-Origin'] = '*'
+    response.headers['Access-Control-Allow-Headers'] = 'Content-Type'
+    response.headers['Access-Control-Allow-Methods'] = 'GET, POST, OPTIONS'
+    return response
+
+
+async def close_executor(app):
+    app['executor'].shutdown(wait=False, cancel_futures=True)
+
+
+async def flush_hand_log(app):
+    app['hand_log'].flush()
+
+
+def create_app(static_folder=STATIC_FOLDER, workers=None, hand_log_path=HAND_LOG_PATH):
+    """Build the aiohttp application"""
+    app = web.Application(middlewares=[cors_middleware])
+    app['static_folder'] = static_folder
+    # Training and evaluation are pure Python loops, so they go to separate
+    # processes rather than threads to keep the GIL off the event loop
+    app['executor'] = ProcessPoolExecutor(max_workers=workers)
+    app['strategy_cache'] = FileCache(os.path.join(static_folder, 'strategies.json'), parse_cfr_strategy)
+    app['metrics_cache'] = FileCache(os.path.join(static_folder, 'metrics_history.json'), lambda s: s)
+    app['hand_log'] = HandLog(hand_log_path)
+    app.on_cleanup.append(close_executor)
+    app.on_cleanup.append(flush_hand_log)
+
+    app.router.add_get('/', serve)
+    app.router.add_post('/api/train', train)
+    app.router.add_get('/api/metrics', get_metrics)
+    app.router.add_post('/api/play', play_game)
+    app.router.add_get('/api/hands/stats', get_hand_stats)
+    app.router.add_static('/', static_folder)
+    return app
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Run the asyncio Kuhn Poker API server')
+    parser.add_argument('--host', default='127.0.0.1', help='Interface to bind')
+    parser.add_argument('--port', type=int, default=5000, help='Port to listen on')
+    parser.add_argument('--workers', type=int, default=None, help='Worker processes for training')
+    parser.add_argument('--static-folder', default=STATIC_FOLDER, help='Directory holding the build and JSON artifacts')
+    parser.add_argument('--hand-log', default=HAND_LOG_PATH, help='Path of the binary hand log')
+    parser.add_argument('--no-hand-log', action='store_true', help='Do not log played hands')
+
+    args = parser.parse_args()
+
+    os.makedirs(args.static_folder, exist_ok=True)
+
+    # Train models if they don't exist
+    if not os.path.exists(os.path.join(args.static_folder, 'strategies.json')):
+        print("Pre-training models...")
+        train_and_save(args.static_folder, 5000, 100)
+
+    hand_log_path = None if args.no_hand_log else args.hand_log
+    web.run_app(create_app(args.static_folder, args.workers, hand_log_path), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
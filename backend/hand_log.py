@@ -0,0 +1,235 @@
+# hand_log.py - Append-only binary log of played hands
+
+import atexit
+import os
+import queue
+import threading
+import time
+
+import numpy as np
+
+from kuhn_poker import KuhnPoker
+
+# Override with the KUHN_HAND_LOG environment variable; set it empty to turn
+# logging off (e.g. for load tests)
+HAND_LOG_PATH = os.environ.get(
+    'KUHN_HAND_LOG', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'hands.bin')) or None
+
+# One fixed-width 8 byte record per hand. Cards and payoff are from player 0's
+# (the human's) point of view; player 1 is the bot.
+HAND_DTYPE = np.dtype([
+    ('timestamp', '<u4'),
+    ('player_card', 'u1'),
+    ('bot_card', 'u1'),
+    ('history', 'u1'),   # see encode_history
+    ('payoff', 'i1'),
+])
+
+MAX_HISTORY = 4
+
+
+def encode_history(history):
+    """Pack a history into one byte: length in the high nibble, action i in bit i"""
+    code = len(history) << 4
+    for i, action in enumerate(history):
+        code |= action << i
+    return code
+
+
+def decode_history(code):
+    """Inverse of encode_history"""
+    return [(code >> i) & 1 for i in range(code >> 4)]
+
+
+def is_valid_hand(game, cards, history):
+    """
+    Check that a hand can be logged: two distinct cards from the deck and a
+    legal terminal history, i.e. only PASS/BET actions, ending at the first
+    terminal state and short enough to fit in encode_history
+    """
+    if len(cards) != 2 or cards[0] == cards[1]:
+        return False
+    if any(card not in range(1, game.num_cards + 1) for card in cards):
+        return False
+    if len(history) >= MAX_HISTORY or any(a not in (game.PASS, game.BET) for a in history):
+        return False
+    return game.is_terminal(history) and \
+        not any(game.is_terminal(history[:i]) for i in range(len(history)))
+
+
+class HandLog:
+    """
+    Append-only hand log backed by a flat file of HAND_DTYPE records.
+
+    append() only enqueues the hand; a background thread drains the queue and
+    writes everything that is pending in a single write call, so request
+    handlers never touch the file. Reads memory-map the file.
+
+    With path=None the log is disabled: hands are validated but not stored.
+    """
+
+    def __init__(self, path=HAND_LOG_PATH, batch_size=4096):
+        """Open the log and start the writer thread unless it is disabled
+
+        Raises:
+            OSError: If the log file can't be opened for appending
+        """
+        self.path = path
+        self.batch_size = batch_size
+        self.game = KuhnPoker()
+        self.queue = queue.Queue()
+
+        if path is not None:
+            # Opened here so a bad path fails at startup instead of killing
+            # the writer thread and leaving flush() waiting forever
+            self.file = open(path, 'ab')
+            # Drop a partial record left by a crash so appends stay aligned
+            size = self.file.seek(0, os.SEEK_END)
+            self.file.truncate(size - size % HAND_DTYPE.itemsize)
+            self.writer = threading.Thread(target=self._write_loop, daemon=True)
+            self.writer.start()
+            atexit.register(self.flush)
+
+    def append(self, cards, history, payoff):
+        """Queue a finished hand for writing
+
+        Raises:
+            ValueError: If the hand is not a legal finished Kuhn Poker hand
+        """
+        if not is_valid_hand(self.game, cards, history):
+            raise ValueError(f"Invalid hand: cards={cards}, history={history}")
+        if payoff != self.game.get_payoff(cards, history):
+            raise ValueError(f"Payoff {payoff} does not match cards={cards}, history={history}")
+        if self.path is None:
+            return
+        self.queue.put((int(time.time()), cards[0], cards[1], encode_history(history), payoff))
+
+    def flush(self):
+        """Block until every queued hand has been written"""
+        self.queue.join()
+
+    def _write_loop(self):
+        with self.file as f:
+            while True:
+                batch = [self.queue.get()]
+                while len(batch) < self.batch_size:
+                    try:
+                        batch.append(self.queue.get_nowait())
+                    except queue.Empty:
+                        break
+
+                # A failed batch is dropped, but the writer keeps running and
+                # flush() still returns
+                try:
+                    f.write(np.array(batch, dtype=HAND_DTYPE).tobytes())
+                    f.flush()
+                except Exception as e:
+                    print(f"Hand log write error, dropped {len(batch)} hands: {str(e)}")
+                finally:
+                    for _ in batch:
+                        self.queue.task_done()
+
+    def read(self):
+        """Memory-map all complete records in the log"""
+        if self.path is None:
+            return np.zeros(0, dtype=HAND_DTYPE)
+
+        try:
+            num_records = os.path.getsize(self.path) // HAND_DTYPE.itemsize
+        except FileNotFoundError:
+            num_records = 0
+
+        if num_records == 0:
+            return np.zeros(0, dtype=HAND_DTYPE)
+        return np.memmap(self.path, dtype=HAND_DTYPE, mode='r', shape=(num_records,))
+
+    def aggregate(self, game=None):
+        """
+        Compute aggregate statistics over every logged hand
+
+        Returns:
+            A JSON-serialisable dict with overall totals, win rate by card,
+            payoff per history and the bot's action frequencies per info set
+        """
+        game = game or KuhnPoker()
+        hands = self.read()
+
+        player_card = hands['player_card'].astype(np.int64)
+        bot_card = hands['bot_card'].astype(np.int64)
+        history = hands['history'].astype(np.int64)
+        payoff = hands['payoff'].astype(np.int64)
+
+        return {
+            "total_hands": int(len(hands)),
+            "total_payoff": int(payoff.sum()),
+            "by_player_card": _by_card(player_card, payoff > 0, payoff, game.num_cards),
+            # Win rate and payoff from the bot's side for its own card
+            "by_bot_card": _by_card(bot_card, payoff < 0, -payoff, game.num_cards),
+            "by_history": _by_history(history, payoff),
+            "bot_actions": _bot_actions(bot_card, history, game),
+        }
+
+
+def _by_card(cards, wins, payoff, num_cards):
+    """Win rate and average payoff for each card value"""
+    size = num_cards + 1
+    counts = np.bincount(cards, minlength=size)
+    win_counts = np.bincount(cards, weights=wins, minlength=size)
+    payoff_sums = np.bincount(cards, weights=payoff, minlength=size)
+
+    result = {}
+    for card in range(1, size):
+        if counts[card] == 0:
+            continue
+        result[str(card)] = {
+            "count": int(counts[card]),
+            "win_rate": float(win_counts[card] / counts[card]),
+            "avg_payoff": float(payoff_sums[card] / counts[card]),
+        }
+    return result
+
+
+def _by_history(history, payoff):
+    """Count, total and average payoff (to player 0) for each terminal history"""
+    codes, inverse, counts = np.unique(history, return_inverse=True, return_counts=True)
+    payoff_sums = np.bincount(inverse, weights=payoff, minlength=len(codes))
+
+    result = {}
+    for code, count, payoff_sum in zip(codes, counts, payoff_sums):
+        key = ':'.join(KuhnPoker.ACTION_STR[a] for a in decode_history(int(code)))
+        result[key] = {
+            "count": int(count),
+            "total_payoff": int(payoff_sum),
+            "avg_payoff": float(payoff_sum / count),
+        }
+    return result
+
+
+def _bot_actions(bot_card, history, game):
+    """PASS/BET frequencies of the bot (player 1) in each info set it acted in"""
+    length = history >> 4
+    counts = {}
+
+    # The bot acts at every odd position of the history
+    for pos in range(1, MAX_HISTORY, 2):
+        acted = length > pos
+        if not acted.any():
+            continue
+
+        prefix = history[acted] & ((1 << pos) - 1)
+        action = (history[acted] >> pos) & 1
+        keys = (bot_card[acted] << MAX_HISTORY) | prefix
+
+        uniq, inverse, totals = np.unique(keys, return_inverse=True, return_counts=True)
+        bets = np.bincount(inverse, weights=action, minlength=len(uniq))
+
+        for key, total, bet_count in zip(uniq, totals, bets):
+            card = int(key) >> MAX_HISTORY
+            prefix_history = [(int(key) >> i) & 1 for i in range(pos)]
+            info_set = game.get_info_set(card, prefix_history)
+            counts[info_set] = {
+                "count": int(total),
+                "PASS": float(1 - bet_count / total),
+                "BET": float(bet_count / total),
+            }
+    return counts
@@ -0,0 +1,88 @@
+# load_test.py - Local load generator for comparing the Flask and asyncio servers
+
+import argparse
+import asyncio
+import random
+import time
+
+import numpy as np
+from aiohttp import ClientSession, TCPConnector
+
+
+def play_payload():
+    """Random player card and a history where it's the bot's turn"""
+    return {"playerCard": random.randint(1, 3), "history": [random.randint(0, 1)]}
+
+
+ENDPOINTS = {
+    "play": ("POST", "/api/play", play_payload),
+    "metrics": ("GET", "/api/metrics", None),
+}
+
+
+async def run_worker(session, base_url, endpoint, counter, latencies, errors):
+    """Send requests one after another until the shared counter runs out"""
+    method, path, payload = ENDPOINTS[endpoint]
+    while counter[0] > 0:
+        counter[0] -= 1
+        json_body = payload() if payload else None
+        start = time.perf_counter()
+        try:
+            async with session.request(method, base_url + path, json=json_body) as response:
+                await response.read()
+                if response.status != 200:
+                    errors.append(response.status)
+                    continue
+        except Exception as e:
+            errors.append(str(e))
+            continue
+        latencies.append(time.perf_counter() - start)
+
+
+async def run_load(base_url, endpoint, num_requests, concurrency):
+    """Fire num_requests at the endpoint with the given number of in-flight requests"""
+    counter = [num_requests]
+    latencies = []
+    errors = []
+
+    connector = TCPConnector(limit=concurrency)
+    async with ClientSession(connector=connector) as session:
+        start = time.perf_counter()
+        await asyncio.gather(*[
+            run_worker(session, base_url, endpoint, counter, latencies, errors)
+            for _ in range(concurrency)
+        ])
+        elapsed = time.perf_counter() - start
+
+    return latencies, errors, elapsed
+
+
+def print_report(endpoint, latencies, errors, elapsed, concurrency):
+    """Print throughput and latency percentiles"""
+    print(f"Endpoint: {endpoint}, concurrency: {concurrency}")
+    print(f"Completed: {len(latencies)}, errors: {len(errors)}, elapsed: {elapsed:.2f}s")
+    if not latencies:
+        return
+
+    latencies_ms = np.array(latencies) * 1000
+    p50, p90, p99 = np.percentile(latencies_ms, [50, 90, 99])
+    print(f"Requests/sec: {len(latencies) / elapsed:.1f}")
+    print(f"Latency ms: p50 {p50:.2f}, p90 {p90:.2f}, p99 {p99:.2f}, max {latencies_ms.max():.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test the Kuhn Poker API')
+    parser.add_argument('--url', default='http://127.0.0.1:5000', help='Base URL of the server')
+    parser.add_argument('--endpoint', choices=sorted(ENDPOINTS), default='play', help='Endpoint to hit')
+    parser.add_argument('--requests', type=int, default=5000, help='Total number of requests')
+    parser.add_argument('--concurrency', type=int, default=64, help='Number of in-flight requests')
+
+    args = parser.parse_args()
+
+    latencies, errors, elapsed = asyncio.run(
+        run_load(args.url, args.endpoint, args.requests, args.concurrency))
+    print_report(args.endpoint, latencies, errors, elapsed, args.concurrency)
+
+
+if __name__ == "__main__":
+    main()
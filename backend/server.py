@@ -3,24 +3,16 @@
 from flask import Flask, jsonify, request, send_from_directory
 from flask_cors import CORS
 from kuhn_poker import KuhnPoker
-from cfr import CFRSolver
-from stupid_bot import StupidBot
+from hand_log import HandLog, HAND_LOG_PATH, is_valid_hand
+from training import train_and_save
 import json
 import os
 import numpy as np
-import time
 
 app = Flask(__name__, static_folder='../frontend/build', static_url_path='')
 CORS(app) 
 
-# Custom JSON encoder for NumPy arrays
-class NumpyEncoder(json.JSONEncoder):
-    def default(self, obj):
-        if isinstance(obj, np.ndarray):
-            return obj.tolist()
-        if isinstance(obj, np.float32):
-            return float(obj)
-        return json.JSONEncoder.default(self, obj)
+hand_log = HandLog(HAND_LOG_PATH)
 
 @app.route('/')
 def serve():
@@ -34,43 +26,8 @@ def train():
         iterations = data.get('iterations', 10000)
         track_interval = data.get('track_interval', 100)
         
-        # 创建游戏和求解器
-        game = KuhnPoker()
-        cfr_solver = CFRSolver(game)
-        
-        # 训练 CFR 求解器
-        start_time = time.time()
-        cfr_strategy = cfr_solver.train(iterations=iterations, track_interval=track_interval)
-        cfr_time = time.time() - start_time
-        
-        # 获取训练指标历史
-        metrics_history = cfr_solver.get_training_history()
-        
-        # 保存训练指标历史
-        with open(os.path.join(app.static_folder, 'metrics_history.json'), 'w') as f:
-            json.dump(metrics_history, f, cls=NumpyEncoder, indent=2)
-        
-        # 保存策略
-        strategies = {
-            "cfr": cfr_strategy,
-            "stupid_bot": {"dummy": [0.0, 1.0]}  # StupidBot 总是选择 BET
-        }
-        
-        with open(os.path.join(app.static_folder, 'strategies.json'), 'w') as f:
-            json.dump(strategies, f, cls=NumpyEncoder, indent=2)
-        
-        # 评估 CFR vs StupidBot
-        results = evaluate_vs_stupid_bot(game, cfr_strategy, num_games=1000)
-        
-        evaluation_results = {
-            "cfr_vs_stupid": results,
-            "training_time": {
-                "cfr": cfr_time
-            }
-        }
-        
-        with open(os.path.join(app.static_folder, 'evaluation_results.json'), 'w') as f:
-            json.dump(evaluation_results, f, cls=NumpyEncoder, indent=2)
+        # 训练、评估并保存策略和指标
+        cfr_time = train_and_save(app.static_folder, iterations, track_interval)
         
         return jsonify({
             "status": "success",
@@ -107,54 +64,6 @@ def get_metrics():
         print(f"获取指标出错: {str(e)}")
         return jsonify({"error": str(e)}), 500
 
-def evaluate_vs_stupid_bot(game, strategy, num_games=1000):
-    """Evaluate CFR strategy against StupidBot"""
-    import random
-    
-    total_payoff = 0
-    
-    for _ in range(num_games):
-        # Deal cards
-        cards = list(range(1, game.num_cards + 1))
-        random.shuffle(cards)
-        cards = cards[:2]  # Take only first 2 cards
-        
-        # Play CFR as player 0, StupidBot as player 1
-        history = []
-        
-        # Game loop
-        while not game.is_terminal(history):
-            player = len(history) % 2
-            
-            if player == 0:  # CFR's turn
-                card = cards[0]
-                info_set = game.get_info_set(card, history)
-                
-                # Get action from CFR strategy
-                if info_set in strategy:
-                    action_probs = strategy[info_set]
-                    action = game.PASS if random.random() < action_probs[0] else game.BET
-                else:
-                    # If info set not in strategy, use uniform random
-                    action = random.choice([game.PASS, game.BET])
-            else:  # StupidBot's turn
-                # StupidBot always bets
-                action = game.BET
-                
-            history.append(action)
-        
-        # Get payoff (from player 0's perspective)
-        payoff = game.get_payoff(cards, history)
-        total_payoff += payoff
-    
-    avg_payoff = total_payoff / num_games
-    return {
-        "avg_payoff": avg_payoff,
-        "total_games": num_games
-    }
-
-
-
 @app.route('/api/play', methods=['POST'])
 def play_game():
     """API endpoint to play a game against the CFR bot"""
@@ -187,8 +96,10 @@ def play_game():
     # Process game history
     history = data.get('history', [])
     
-    # If it's bot's turn
-    if len(history) % 2 == 1:
+    # If it's bot's turn. A PASS:BET hand ends on the player's action, so it
+    # can arrive already finished and the bot must not act on it
+    bot_acted = len(history) % 2 == 1 and not game.is_terminal(history)
+    if bot_acted:
         bot_card = cards[1]
         info_set = game.get_info_set(bot_card, history)
         
@@ -204,6 +115,13 @@ def play_game():
     is_terminal = game.is_terminal(history)
     payoff = game.get_payoff(cards, history) if is_terminal else 0
     
+    # Log hands the bot finished in this request, and PASS:BET hands the
+    # player finished after the bot's bet. The latter need a fixed playerCard
+    # so the bot is dealt the same card it bet with.
+    player_finished = not bot_acted and player_card and history[:2] == [game.PASS, game.BET]
+    if is_terminal and (bot_acted or player_finished) and is_valid_hand(game, cards, history):
+        hand_log.append(cards, history, payoff)
+    
     return jsonify({
         'cards': cards,
         'history': history,
@@ -211,6 +129,15 @@ def play_game():
         'payoff': payoff
     })
 
+@app.route('/api/hands/stats', methods=['GET'])
+def get_hand_stats():
+    """API endpoint to get aggregate statistics over all logged hands"""
+    try:
+        return jsonify(hand_log.aggregate())
+    except Exception as e:
+        print(f"Hand stats error: {str(e)}")
+        return jsonify({"error": str(e)}), 500
+
 if __name__ == '__main__':
     # Ensure directories exist
     # os.makedirs(app.static_folder, exist_ok=True)
@@ -220,37 +147,7 @@ if __name__ == '__main__':
     # Train models if they don't exist
     if not os.path.exists(os.path.join(app.static_folder, 'strategies.json')):
         print("Pre-training models...")
-        game = KuhnPoker()
-        cfr_solver = CFRSolver(game)
-        
         # Train with fewer iterations for startup speed
-        cfr_strategy = cfr_solver.train(iterations=5000, track_interval=100)
-        
-        # Save metrics history
-        metrics_history = cfr_solver.get_metrics_history()
-        with open(os.path.join(app.static_folder, 'metrics_history.json'), 'w') as f:
-            json.dump(metrics_history, f, cls=NumpyEncoder, indent=2)
-        
-        # Save strategies
-        strategies = {
-            "cfr": cfr_strategy,
-            "stupid_bot": {"dummy": [0.0, 1.0]}  # StupidBot always chooses BET
-        }
-        
-        with open(os.path.join(app.static_folder, 'strategies.json'), 'w') as f:
-            json.dump(strategies, f, cls=NumpyEncoder, indent=2)
-            
-        # Quick evaluation
-        results = evaluate_vs_stupid_bot(game, cfr_strategy, num_games=1000)
-        
-        evaluation_results = {
-            "cfr_vs_stupid": results,
-            "training_time": {
-                "cfr": 0
-            }
-        }
-        
-        with open(os.path.join(app.static_folder, 'evaluation_results.json'), 'w') as f:
-            json.dump(evaluation_results, f, cls=NumpyEncoder, indent=2)
+        train_and_save(app.static_folder, 5000, 100)
     
     app.run(debug=True)
\ No newline at end of file
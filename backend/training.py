@@ -0,0 +1,79 @@
+# training.py - Train CFR and write the JSON artifacts served by the API servers
+
+import json
+import os
+import tempfile
+import time
+
+import numpy as np
+
+from kuhn_poker import KuhnPoker
+from cfr import CFRSolver
+from main import evaluate_vs_stupid_bot
+
+# os.umask can only be read by setting it, so do it once at import time
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+# Custom JSON encoder for NumPy arrays
+class NumpyEncoder(json.JSONEncoder):
+    def default(self, obj):
+        if isinstance(obj, np.ndarray):
+            return obj.tolist()
+        if isinstance(obj, np.float32):
+            return float(obj)
+        return json.JSONEncoder.default(self, obj)
+
+
+def dump_json(obj, path):
+    """Write obj to path atomically so readers never see a half-written file"""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.tmp')
+    try:
+        # mkstemp creates the file 0600; give it the mode open() would have
+        os.fchmod(fd, 0o666 & ~_UMASK)
+        with os.fdopen(fd, 'w') as f:
+            json.dump(obj, f, cls=NumpyEncoder, indent=2)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+
+
+def train_and_save(static_folder, iterations, track_interval, num_games=1000):
+    """
+    Train CFR, evaluate it against StupidBot and write the JSON artifacts
+
+    Used by both servers; async_server.py runs it in a worker process, so it
+    must stay a module-level function and this module must not import Flask.
+
+    Returns:
+        The CFR training time in seconds
+    """
+    game = KuhnPoker()
+    cfr_solver = CFRSolver(game)
+
+    start_time = time.time()
+    cfr_strategy = cfr_solver.train(iterations=iterations, track_interval=track_interval)
+    cfr_time = time.time() - start_time
+
+    dump_json(cfr_solver.get_training_history(), os.path.join(static_folder, 'metrics_history.json'))
+
+    strategies = {
+        "cfr": cfr_strategy,
+        "stupid_bot": {"dummy": [0.0, 1.0]}  # StupidBot always chooses BET
+    }
+    dump_json(strategies, os.path.join(static_folder, 'strategies.json'))
+
+    evaluation_results = {
+        "cfr_vs_stupid": {
+            "avg_payoff": evaluate_vs_stupid_bot(game, cfr_strategy, num_games),
+            "total_games": num_games
+        },
+        "training_time": {
+            "cfr": cfr_time
+        }
+    }
+    dump_json(evaluation_results, os.path.join(static_folder, 'evaluation_results.json'))
+
+    return cfr_time